@@ -0,0 +1,169 @@
+import streamlit as st
+import requests
+import pandas as pd
+from io import BytesIO
+import zipfile
+import threading
+import html
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+from numba import cuda, njit, prange
+from PIL import Image
+
+# Number of images downloaded concurrently when building the zip file
+MAX_DOWNLOAD_WORKERS = 16
+
+# (connect, read) timeout in seconds for every HTTP request
+REQUEST_TIMEOUT = (3, 10)
+
+# Shared HTTP session so all requests reuse pooled keep-alive connections.
+# Cached as a resource so it survives reruns instead of being rebuilt each time.
+@st.cache_resource
+def get_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=MAX_DOWNLOAD_WORKERS,
+        pool_maxsize=MAX_DOWNLOAD_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.2)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Function to fetch the raw inscriptions from the API
+def fetch_inscriptions(url):
+    st.write(f"Fetching data from {url}...")  # Debug info
+    response = get_session().get(url, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 200:
+        st.write("Data fetched successfully.")  # Debug info
+        return orjson.loads(response.content)
+    else:
+        st.error(f"Failed to retrieve data. Status code: {response.status_code}")
+        return []
+
+# Function to filter inscriptions from the last 24 hours and sort by views
+def filter_and_sort_inscriptions(inscriptions):
+    df = pd.DataFrame(inscriptions)
+    try:
+        created_at = pd.to_datetime(df['created_at'], format='ISO8601', cache=True)
+    except ValueError:
+        created_at = None
+    # Mixed UTC offsets don't fit one datetime64 column, so normalize those to UTC
+    if created_at is None or not pd.api.types.is_datetime64_any_dtype(created_at):
+        created_at = pd.to_datetime(df['created_at'], format='ISO8601', utc=True, cache=True)
+    # Timestamps without a timezone are compared against local time, like datetime.fromisoformat
+    last_24_hours = pd.Timestamp.now(tz=created_at.dt.tz) - pd.Timedelta(hours=24)
+    df = df.loc[created_at > last_24_hours]
+    return df.sort_values('views', ascending=False, kind='stable').reset_index(drop=True)
+
+# Cache fetching and filtering together, keyed on the URL, so the filtered
+# DataFrame always comes from the same payload and the raw records are never hashed.
+# Returns the number of inscriptions fetched and the filtered DataFrame (None if nothing was fetched).
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def load_inscriptions(url):
+    inscriptions = fetch_inscriptions(url)
+    if not inscriptions:
+        return 0, None
+    return len(inscriptions), filter_and_sort_inscriptions(inscriptions)
+
+# Function to serialize data as CSV for download
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_table_download_data(df):
+    csv_buffer = BytesIO()
+    df.to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue()
+
+# Function to download a single image; returns None if it can't be fetched
+def fetch_image(session, img_url):
+    try:
+        response = session.get(img_url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    return response.content
+
+# Function to bundle images into a zip file for download
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_zip_download_data(images):
+    zip_buffer = BytesIO()
+    with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        blobs = executor.map(partial(fetch_image, get_session()), [img_url for img_url, _ in images])
+        # PNGs are already deflate-compressed, so store them as-is
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+            skipped = 0
+            for i, img_data in enumerate(blobs):
+                if img_data is None:
+                    skipped += 1
+                    continue
+                img_name = f"image_{i}.png"
+                zip_file.writestr(img_name, img_data)
+    if skipped:
+        st.warning(f"Skipped {skipped} image(s) that could not be downloaded.")
+    return zip_buffer.getvalue()
+
+# Chart aggregations, cached so unrelated reruns don't recompute them
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_views_histogram(views):
+    counts, edges = np.histogram(views, bins=20)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def get_category_counts(categories):
+    counts = categories.value_counts()
+    return pd.DataFrame({'category': counts.index.astype(str), 'count': counts.to_numpy()})
+
+# Function to render a page of inscriptions as a lazily loaded image grid
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def get_gallery_html(records):
+    cards = "".join(
+        f'<div><img loading="lazy" src="{html.escape(str(ins["image_url"]))}" style="width:100%">'
+        f'<p><b>Title:</b> {html.escape(str(ins["title"]))}<br>'
+        f'<b>Views:</b> {html.escape(str(ins["views"]))}<br>'
+        f'<b>Created At:</b> {html.escape(str(ins["created_at"]))}</p></div>'
+        for ins in records
+    )
+    return f'<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:1rem">{cards}</div>'
+
+# Streamlit runs every session on its own thread, but Numba's fallback workqueue
+# threading layer aborts the process if two threads launch parallel kernels at once
+JULIA_LOCK = threading.Lock()
+
+# Function to encode a grayscale frame as PNG with fast compression
+def encode_png(pixels):
+    png_buffer = BytesIO()
+    Image.fromarray(pixels).save(png_buffer, 'PNG', compress_level=1)
+    return png_buffer.getvalue()
+
+# Julia set kernel. N[j, i] is the grayscale shade of the pixel: the last iteration
+# at which it was still bounded, scaled by the largest possible count and inverted.
+@njit(parallel=True, fastmath=True, cache=True)
+def julia(Z, c, iterations, N):
+    n, m = N.shape
+    for j in prange(n):
+        for i in range(m):
+            z = Z[j, i]
+            count = 0
+            for k in range(iterations):
+                z = z * z + c
+                if z.real * z.real + z.imag * z.imag > 4.0:
+                    break
+                count = k
+            N[j, i] = 255 - count * 255 // (iterations - 1)
+
+# Same kernel for CUDA devices, one thread per pixel; x walks columns so loads coalesce
+@cuda.jit
+def julia_cuda(Z, c, iterations, N):
+    i, j = cuda.grid(2)
+    if j < N.shape[0] and i < N.shape[1]:
+        z = Z[j, i]
+        count = 0
+        for k in range(iterations):
+            z = z * z + c
+            if z.real * z.real + z.imag * z.imag > 4.0:
+                break
+            count = k
+        N[j, i] = 255 - count * 255 // (iterations - 1)